@@ -1,78 +1,134 @@
 import asyncio
 import keyboard
-from pathlib import Path
-import yaml
+import os
 import sys
+import time
 
+try:
+    import uvloop  # Faster event loop; not available on Windows
+except ImportError:
+    uvloop = None
+
+from src.config import DEFAULT_CONFIG_PATH, load_config
 from src.handlers.gps_BLT_handler import BLTHandler
 from src.handlers.gps_PACKET_parser import PacketParser, ParsedData
 
+# ANSI clear-screen prefix for display frames
+_CLEAR_SCREEN = "\033[H\033[J\n"
+
+# printf-style frame templates, filled with a single % per frame
+_MOTION_FORMAT = (
+    "\nMotion Data:\n"
+    "Acceleration (g):\n"
+    "  X: %7.3f | Y: %7.3f | Z: %7.3f\n"
+    "Rotation (deg/s):\n"
+    "  X: %7.2f | Y: %7.2f | Z: %7.2f\n"
+)
+_GPS_FORMAT = (
+    "\nGPS Data (%s, Satellites: %d):\n"
+    "Position: %10.6f°, %10.6f°\n"
+    "Speed: %6.1f km/h\n"
+    "Altitude (MSL): %6.1f m\n"
+)
+_CONTROLS = (
+    "\nControls:\n"
+    "q - Toggle data display\n"
+    "Ctrl+C - Exit program\n"
+)
+
 class RaceboxApp:
+    __slots__ = ('config_path', 'config', 'parser', 'display_data',
+                 '_refresh_interval_ns', '_next_refresh_ns', '_stdout',
+                 '_binary_stdout', '_encoding', '_frame_format')
+
     def __init__(self):
         """Initialize the RaceBox application."""
         # Load configuration
-        self.config_path = Path(__file__).parent / 'src' / 'config' / 'config.yaml'
-        with open(self.config_path) as f:
-            self.config = yaml.safe_load(f)
+        self.config_path = DEFAULT_CONFIG_PATH
+        self.config = load_config(self.config_path)
 
         # Initialize components
         self.parser = PacketParser(self.config_path)
         self.display_data = False
-        self.last_update = 0
+
+        # Redraw at most display.refresh_rate times per second
+        self._refresh_interval_ns = int(1e9 / self.config['display']['refresh_rate'])
+        self._next_refresh_ns = 0
+
+        # Frames are written to stdout's binary buffer when it has one; some
+        # IDE consoles and redirections only offer the text layer
+        self._stdout = sys.stdout
+        self._binary_stdout = getattr(sys.stdout, 'buffer', None)
+        self._encoding = sys.stdout.encoding or 'utf-8'
+
+        # Frame template, with the clear-screen prefix and controls footer if enabled
+        frame_format = _MOTION_FORMAT + _GPS_FORMAT
+        if self.config['display']['clear_screen']:
+            frame_format = _CLEAR_SCREEN + frame_format
+        if self.config['display'].get('show_controls', True):
+            frame_format += _CONTROLS
+        if self._binary_stdout is not None:
+            # The binary buffer skips the text layer's newline translation,
+            # so apply it here once (\r\n on Windows)
+            frame_format = frame_format.replace("\n", os.linesep)
+        self._frame_format = frame_format
 
     def handle_parsed_data(self, parsed_data: ParsedData):
         """Display parsed data in a formatted way."""
-        if self.config['display']['clear_screen']:
-            print("\033[H\033[J")  # Clear screen
-
-        # Display motion data
-        print("\nMotion Data:")
-        print(f"Acceleration (g):")
-        print(f"  X: {parsed_data.motion.acc_x:7.3f} | "
-              f"Y: {parsed_data.motion.acc_y:7.3f} | "
-              f"Z: {parsed_data.motion.acc_z:7.3f}")
-        print(f"Rotation (deg/s):")
-        print(f"  X: {parsed_data.motion.rot_x:7.2f} | "
-              f"Y: {parsed_data.motion.rot_y:7.2f} | "
-              f"Z: {parsed_data.motion.rot_z:7.2f}")
-
-        # Display GPS data
-        print(f"\nGPS Data ({parsed_data.location.fix_status}, "
-              f"Satellites: {parsed_data.location.satellites}):")
-        print(f"Position: {parsed_data.location.latitude:10.6f}°, "
-              f"{parsed_data.location.longitude:10.6f}°")
-        print(f"Speed: {parsed_data.location.speed:6.1f} km/h")
-        print(f"Altitude (MSL): {parsed_data.location.altitude_msl:6.1f} m")
-
-        # Display controls if enabled
-        if self.config['display']['show_controls']:
-            print("\nControls:")
-            print("q - Toggle data display")
-            print("Ctrl+C - Exit program")
-
-    def handle_bluetooth_data(self, data: bytes):
+        motion = parsed_data.motion
+        location = parsed_data.location
+
+        frame = self._frame_format % (
+            motion.acc_x, motion.acc_y, motion.acc_z,
+            motion.rot_x, motion.rot_y, motion.rot_z,
+            location.fix_status, location.satellites,
+            location.latitude, location.longitude,
+            location.speed, location.altitude_msl,
+        )
+
+        # Write bytes straight to the binary buffer, after flushing any
+        # pending text output so messages keep their order
+        self._stdout.flush()
+        if self._binary_stdout is None:
+            self._stdout.write(frame)
+            self._stdout.flush()
+            return
+        self._binary_stdout.write(frame.encode(self._encoding, 'replace'))
+        self._binary_stdout.flush()
+
+    def handle_bluetooth_data(self, data: bytearray):
         """Handle incoming Bluetooth data."""
         # Process packets
         complete_packets = self.parser.add_data(data)
-        
-        # Parse and display each complete packet
-        for packet in complete_packets:
-            if self.display_data:
-                parsed_data = self.parser.parse_packet(packet)
-                if parsed_data:
-                    self.handle_parsed_data(parsed_data)
-
-    async def keyboard_monitor(self):
-        """Monitor keyboard for control commands."""
-        while True:
-            if keyboard.is_pressed('q'):
-                self.display_data = not self.display_data
-                if self.display_data:
-                    print("\nStarting data display...")
-                else:
-                    print("\nPausing data display...")
-                await asyncio.sleep(0.5)  # Debounce
-            await asyncio.sleep(0.1)
+        if not complete_packets or not self.display_data:
+            return
+
+        # Throttle redraws to the refresh rate using integer monotonic ticks.
+        # Deadlines advance by a fixed interval and a packet up to half an
+        # interval early still counts, so BLE timing jitter doesn't skip
+        # redraws when the refresh rate matches the sampling rate
+        now = time.monotonic_ns()
+        interval = self._refresh_interval_ns
+        if now < self._next_refresh_ns - (interval >> 1):
+            return
+        next_refresh = self._next_refresh_ns + interval
+        if next_refresh < now:
+            # Far behind, e.g. after the display was paused: start over from now
+            next_refresh = now + interval
+        self._next_refresh_ns = next_refresh
+
+        # Each redraw replaces the previous one, so only the newest packet is parsed
+        parsed_data = self.parser.parse_packet(complete_packets[-1])
+        if parsed_data:
+            self.handle_parsed_data(parsed_data)
+
+    def _toggle_display(self):
+        """Toggle data display on or off."""
+        self.display_data = not self.display_data
+        if self.display_data:
+            print("\nStarting data display...")
+        else:
+            print("\nPausing data display...")
 
     async def run(self):
         """Main application loop."""
@@ -86,22 +142,18 @@ class RaceboxApp:
                 data_callback=self.handle_bluetooth_data
             )
 
-            # Start keyboard monitoring
-            keyboard_task = asyncio.create_task(self.keyboard_monitor())
+            # Hotkey callbacks fire on the keyboard library's thread,
+            # so hand the toggle over to the event loop. Triggering on
+            # release replaces the old debounce: key repeat can't re-toggle.
+            loop = asyncio.get_running_loop()
+            keyboard.add_hotkey('q', lambda: loop.call_soon_threadsafe(self._toggle_display),
+                                trigger_on_release=True)
 
             try:
                 # Start BLT handler
                 await blt_handler.connect_and_run()
             except Exception as e:
                 print(f"Error in BLT handler: {e}")
-            finally:
-                # Clean up keyboard task
-                if not keyboard_task.done():
-                    keyboard_task.cancel()
-                    try:
-                        await keyboard_task
-                    except asyncio.CancelledError:
-                        pass
 
         except Exception as e:
             print(f"Application error: {e}")
@@ -121,6 +173,9 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         print("\nApplication terminated by user.")
\ No newline at end of file
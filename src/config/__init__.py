@@ -0,0 +1,25 @@
+from copy import deepcopy
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_CONFIG_PATH = Path(__file__).parent / 'config.yaml'
+
+@lru_cache(maxsize=8)
+def _load_config_file(path: str) -> dict:
+    """Parse a YAML config file once per path."""
+    import yaml  # Deferred so importing the package doesn't pay for PyYAML
+
+    # libyaml's C loader when PyYAML was built with it, the pure-Python one otherwise
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    with open(path) as f:
+        return yaml.load(f, Loader=loader)
+
+def load_config(config_path: Path = None) -> dict:
+    """
+    Load the YAML configuration, defaulting to the bundled config.yaml.
+    Files are parsed once and cached; each caller gets its own copy, so
+    changing it doesn't affect other components.
+    """
+    if config_path is None:
+        config_path = DEFAULT_CONFIG_PATH
+    return deepcopy(_load_config_file(str(Path(config_path).resolve())))
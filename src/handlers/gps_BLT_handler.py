@@ -1,43 +1,66 @@
 import asyncio
 from bleak import BleakScanner, BleakClient
 from pathlib import Path
-import yaml
+
+from ..config import load_config
 
 class BLTHandler:
     """
     Handles Bluetooth Low Energy (BLE) communication with RaceBox devices.
     Responsible for device scanning, connection management, and data reception.
     """
+    __slots__ = ('config', 'device_info', 'client', 'data_callback', '_is_connected',
+                 '_tx_uuid', '_name_prefixes', '_stop_event', '_queue',
+                 'dropped_notifications')
+
     def __init__(self, config_path: Path = None, data_callback=None):
         # Load configuration
-        if config_path is None:
-            config_path = Path(__file__).parents[1] / 'config' / 'config.yaml'
-        with open(config_path) as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_config(config_path)
         
         # Initialize variables
         self.device_info = None
         self.client = None
         self.data_callback = data_callback
         self._is_connected = False
+        self._tx_uuid = self.config['bluetooth']['tx_char_uuid']
+        self._name_prefixes = tuple(self.config['device']['name_prefixes'])
+        self._stop_event = asyncio.Event()
+
+        # Notifications are queued and handed to data_callback by a separate
+        # task, so slow consumers can't stall BLE reception
+        self._queue = asyncio.Queue(maxsize=256)
+        self.dropped_notifications = 0
 
     async def find_device(self):
-        """Scans for RaceBox devices and returns the first one found."""
+        """Scans for RaceBox devices and returns the first one found, or None if stop() is called first."""
         print("Scanning for RaceBox devices...")
-        while True:
-            devices = await BleakScanner.discover()
-            for device in devices:
-                if device.name and device.name.startswith(tuple(self.config['device']['name_prefixes'])):
-                    print("\nRaceBox device found!")
-                    print(f"Name: {device.name}")
-                    print(f"Address: {device.address}")
-                    if hasattr(device, 'advertisement_data'):
-                        rssi = device.advertisement_data.rssi
-                        print(f"Signal Strength: {rssi} dBm")
-                    self.device_info = device
-                    return device.address
-            print(".", end="", flush=True)
-            await asyncio.sleep(self.config['bluetooth']['scan_interval'])
+        found = asyncio.Event()
+        match = []
+
+        def detection_callback(device, advertisement_data):
+            # Called for every advertisement as it arrives
+            if not found.is_set() and device.name and device.name.startswith(self._name_prefixes):
+                match.append((device, advertisement_data))
+                found.set()
+
+        async with BleakScanner(detection_callback=detection_callback):
+            while not found.is_set() and not self._stop_event.is_set():
+                try:
+                    await asyncio.wait_for(found.wait(), self.config['bluetooth']['scan_interval'])
+                except asyncio.TimeoutError:
+                    print(".", end="", flush=True)
+
+        if not match:
+            print("\nScan stopped.")
+            return None
+
+        device, advertisement_data = match[0]
+        print("\nRaceBox device found!")
+        print(f"Name: {device.name}")
+        print(f"Address: {device.address}")
+        print(f"Signal Strength: {advertisement_data.rssi} dBm")
+        self.device_info = device
+        return device.address
 
     async def _configure_connection(self, client):
         """Configures BLE connection parameters for optimal performance."""
@@ -63,10 +86,27 @@ class BLTHandler:
         except Exception as e:
             print(f"Note: Using default BLE parameters ({e})")
 
-    def _notification_handler(self, sender, data):
-        """Handles incoming BLE notifications."""
+    def _notification_handler(self, sender, data: bytearray):
+        """Handles incoming BLE notifications. Bleak's bytearray is queued as-is, without a copy."""
         if self.data_callback:
-            self.data_callback(data)
+            try:
+                self._queue.put_nowait(data)
+            except asyncio.QueueFull:
+                self.dropped_notifications += 1
+
+    async def _consume_notifications(self):
+        """Delivers queued notifications to the data callback."""
+        while True:
+            data = await self._queue.get()
+            try:
+                self.data_callback(data)
+            except Exception as e:
+                print(f"Error in data callback: {e}")
+
+    def _drain_queue(self):
+        """Discards all queued notifications."""
+        while not self._queue.empty():
+            self._queue.get_nowait()
 
     async def connect_and_run(self):
         """
@@ -74,7 +114,8 @@ class BLTHandler:
         and maintains the connection with retry logic.
         """
         retry_count = 0
-        
+        self._stop_event.clear()
+
         while retry_count < self.config['device']['max_retry_attempts']:
             try:
                 # Find device if not already connected
@@ -83,6 +124,10 @@ class BLTHandler:
                     if not device_address:
                         return False
 
+                # stop() may have been called while scanning
+                if self._stop_event.is_set():
+                    break
+
                 print("\nConnecting to device...")
                 async with BleakClient(device_address, 
                                      timeout=self.config['bluetooth']['connection_timeout']) as client:
@@ -91,23 +136,30 @@ class BLTHandler:
                     self._is_connected = True
                     print("Connected successfully!")
                     
-                    # Start notification handler
-                    await client.start_notify(
-                        self.config['bluetooth']['tx_char_uuid'],
-                        self._notification_handler
-                    )
-                    
-                    # Keep connection alive
+                    # Start notification handler and its consumer, dropping
+                    # anything left queued from a previous connection
+                    self._drain_queue()
+                    await client.start_notify(self._tx_uuid, self._notification_handler)
+                    consumer_task = asyncio.create_task(self._consume_notifications())
+
+                    # Keep connection alive until stop() is called
                     try:
-                        while True:
-                            await asyncio.sleep(0.1)
+                        await self._stop_event.wait()
                     except asyncio.CancelledError:
                         print("\nConnection cancelled...")
                         raise
                     finally:
-                        # Clean up notifications
-                        await client.stop_notify(self.config['bluetooth']['tx_char_uuid'])
-                        self._is_connected = False
+                        # Stop the consumer first: stop_notify raises if the
+                        # device has dropped, and a retry starts a new consumer
+                        consumer_task.cancel()
+                        await asyncio.gather(consumer_task, return_exceptions=True)
+                        try:
+                            await client.stop_notify(self._tx_uuid)
+                        finally:
+                            self._is_connected = False
+
+                print("\nDisconnected.")
+                break
 
             except asyncio.CancelledError:
                 print("\nStopping BLE handler gracefully...")
@@ -115,18 +167,34 @@ class BLTHandler:
             except Exception as e:
                 print(f"Connection error: {e}")
                 self._is_connected = False
+
+                # Errors after stop(), e.g. stop_notify on a dropped link, end the run
+                if self._stop_event.is_set():
+                    print("\nDisconnected.")
+                    break
+
                 retry_count += 1
                 if retry_count < self.config['device']['max_retry_attempts']:
                     retry_delay = self.config['device']['retry_delay']
                     print(f"Retrying in {retry_delay} seconds... "
                           f"(Attempt {retry_count + 1}/{self.config['device']['max_retry_attempts']})")
-                    await asyncio.sleep(retry_delay)
+
+                    # Wait out the delay, unless stop() is called meanwhile
+                    try:
+                        await asyncio.wait_for(self._stop_event.wait(), retry_delay)
+                        break
+                    except asyncio.TimeoutError:
+                        pass
                 else:
                     print("Max retry attempts reached. Exiting...")
                     break
 
         return self._is_connected
 
+    def stop(self):
+        """Requests a graceful disconnect; connect_and_run returns once it is done."""
+        self._stop_event.set()
+
     def is_connected(self):
         """Returns current connection status."""
         return self._is_connected
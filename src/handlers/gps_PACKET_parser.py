@@ -1,8 +1,51 @@
 from dataclasses import dataclass
-from typing import List, Optional
-import yaml  # Add this import
+from itertools import accumulate
+import logging
+import struct
+import time
+from typing import Dict, List, Optional, Tuple, Union
 
-@dataclass
+from ..config import load_config
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for batch decoding
+    np = None
+
+logger = logging.getLogger(__name__)
+
+PACKET_START = b'\xb5\x62'  # UBX start sequence
+PACKET_SIZE = 88  # 80-byte payload plus 8 bytes of UBX framing
+
+# Precompiled little-endian layout of the full UBX frame (6-byte header,
+# 80-byte payload, 2-byte checksum), read in place with unpack_from:
+# fix, sats, lon, lat, alt_wgs, alt_msl, speed, acc x/y/z, rot x/y/z
+_PACKET = struct.Struct('<26xB2xB4i8xi16x6h2x')
+
+# Unit conversions as reciprocals, so fields are scaled by multiplication
+_G_PER_MG = 1e-3         # milli-g to g
+_DPS_PER_CDPS = 1e-2     # centi-deg/s to deg/s
+_DEG_PER_UNIT = 1e-7     # 1e-7 deg to deg
+_KMH_PER_MMS = 3.6e-3    # mm/s to km/h
+_M_PER_MM = 1e-3         # mm to m
+
+# Fix status text for every possible value of the unsigned fix byte
+_FIX_STATUS = tuple("3D FIX" if fix == 3 else "NO FIX" for fix in range(256))
+
+# Same layout as a numpy record, for decoding many packets in one pass.
+PACKET_DTYPE = np.dtype({
+    'names': ['itow', 'fix', 'sats', 'lon', 'lat', 'alt_wgs', 'alt_msl', 'speed', 'acc', 'rot'],
+    'formats': ['<u4', 'u1', 'u1', '<i4', '<i4', '<i4', '<i4', '<i4', ('<i2', 3), ('<i2', 3)],
+    'offsets': [6, 26, 29, 30, 34, 38, 42, 54, 74, 80],
+    'itemsize': 88,
+}) if np is not None else None
+
+def _require_numpy():
+    """Raise ImportError if numpy, needed for batch decoding, isn't installed."""
+    if np is None:
+        raise ImportError("numpy is required for batch packet parsing")
+
+@dataclass(slots=True)
 class MotionData:
     """Data class for motion-related measurements."""
     acc_x: float  # Acceleration in g
@@ -12,7 +55,7 @@ class MotionData:
     rot_y: float
     rot_z: float
 
-@dataclass
+@dataclass(slots=True)
 class LocationData:
     """Data class for GPS-related measurements."""
     latitude: float
@@ -23,113 +66,370 @@ class LocationData:
     altitude_wgs: float  # Altitude in meters
     altitude_msl: float
 
-@dataclass
+@dataclass(slots=True)
 class ParsedData:
     """Complete parsed data from a RaceBox packet."""
     motion: MotionData
     location: LocationData
-    raw_data: bytes
+    raw_data: Optional[bytes] = None  # Only kept when debug.log_raw_data is set
+
+def _decode_fields(fix: int, satellites: int, lon: int, lat: int, alt_wgs: int,
+                   alt_msl: int, speed: int, acc_x: int, acc_y: int, acc_z: int,
+                   rot_x: int, rot_y: int, rot_z: int) -> Tuple[MotionData, LocationData]:
+    """Scale raw integer packet fields, in _PACKET order, to motion and location data."""
+    motion_data = MotionData(
+        acc_x * _G_PER_MG, acc_y * _G_PER_MG, acc_z * _G_PER_MG,
+        rot_x * _DPS_PER_CDPS, rot_y * _DPS_PER_CDPS, rot_z * _DPS_PER_CDPS
+    )
+    location_data = LocationData(
+        latitude=lat * _DEG_PER_UNIT,
+        longitude=lon * _DEG_PER_UNIT,
+        speed=speed * _KMH_PER_MMS,
+        satellites=satellites,
+        fix_status=_FIX_STATUS[fix],
+        altitude_wgs=alt_wgs * _M_PER_MM,
+        altitude_msl=alt_msl * _M_PER_MM
+    )
+    return motion_data, location_data
+
+def _decode_packet(packet: bytes) -> Tuple[MotionData, LocationData]:
+    """Decode motion and location data from a complete frame in one pass."""
+    return _decode_fields(*_PACKET.unpack_from(packet))
+
+# Display-unit columns of a batch: name -> (PACKET_DTYPE field, scale factor)
+_SCALED_FIELDS = {
+    'latitude': ('lat', _DEG_PER_UNIT),
+    'longitude': ('lon', _DEG_PER_UNIT),
+    'speed': ('speed', _KMH_PER_MMS),          # km/h
+    'altitude_wgs': ('alt_wgs', _M_PER_MM),    # m
+    'altitude_msl': ('alt_msl', _M_PER_MM),
+    'acceleration': ('acc', _G_PER_MG),        # (N, 3) g
+    'rotation': ('rot', _DPS_PER_CDPS),        # (N, 3) deg/s
+}
+
+def scale_records(records: "np.ndarray") -> Dict[str, "np.ndarray"]:
+    """
+    Convert PACKET_DTYPE records to float columns in display units.
+    Each column is one vectorized multiply by the same reciprocal factors
+    the per-packet decoder uses; acceleration and rotation are (N, 3).
+    """
+    return {name: records[field] * scale for name, (field, scale) in _SCALED_FIELDS.items()}
+
+def _scaled_column(name: str) -> property:
+    """ParsedBatch property computing one _SCALED_FIELDS column on access."""
+    field, scale = _SCALED_FIELDS[name]
+    return property(lambda self: self.columns[field] * scale,
+                    doc=f"{name} of every packet, in display units.")
+
+# Scalar PACKET_DTYPE fields in _PACKET order, followed by acc and rot
+_SCALAR_FIELDS = ('fix', 'sats', 'lon', 'lat', 'alt_wgs', 'alt_msl', 'speed')
+
+class ParsedBatch:
+    """
+    Parsed data for many packets, stored column by column (SoA).
+    `columns` maps each PACKET_DTYPE field name to its own contiguous
+    integer array, (N, 3) int16 for acc and rot, 38 bytes per packet in
+    all. Float columns in display units are computed from them when
+    accessed. Indexing returns the ParsedData of a single packet.
+    """
+    __slots__ = ('columns', '_raw_packets')
+
+    def __init__(self, records: "np.ndarray", keep_raw_data: bool = False):
+        """
+        Copy PACKET_DTYPE records into per-field columns; the batch never
+        aliases them, so records may be a view of the packet ring. The full
+        packets are kept as well only with keep_raw_data, for ParsedData.raw_data.
+        """
+        # copy() rather than ascontiguousarray(), which returns single-row
+        # fields as views that would still alias the records
+        self.columns = {name: records[name].copy() for name in records.dtype.names}
+        self._raw_packets = records.tobytes() if keep_raw_data else None
+
+    @property
+    def time_of_week(self) -> "np.ndarray":
+        """GPS time of week in ms."""
+        return self.columns['itow']
+
+    @property
+    def fix(self) -> "np.ndarray":
+        return self.columns['fix']
+
+    @property
+    def satellites(self) -> "np.ndarray":
+        return self.columns['sats']
+
+    latitude = _scaled_column('latitude')
+    longitude = _scaled_column('longitude')
+    speed = _scaled_column('speed')
+    altitude_wgs = _scaled_column('altitude_wgs')
+    altitude_msl = _scaled_column('altitude_msl')
+    acceleration = _scaled_column('acceleration')
+    rotation = _scaled_column('rotation')
+
+    def __len__(self) -> int:
+        return len(self.columns['itow'])
+
+    def __getitem__(self, index: int) -> ParsedData:
+        """Decode one packet of the batch, exactly as parse_packet would."""
+        index = range(len(self))[index]
+        columns = self.columns
+        fields = [columns[name][index].item() for name in _SCALAR_FIELDS]
+        fields += columns['acc'][index].tolist() + columns['rot'][index].tolist()
+        motion_data, location_data = _decode_fields(*fields)
+
+        raw_data = None
+        if self._raw_packets is not None:
+            raw_data = self._raw_packets[index * PACKET_SIZE:(index + 1) * PACKET_SIZE]
+        return ParsedData(motion=motion_data, location=location_data, raw_data=raw_data)
 
 class PacketParser:
     """
     Handles RaceBox packet assembly and parsing.
     Implements the UBX protocol for RaceBox devices.
     """
+    __slots__ = ('config', 'keep_raw_data', 'buffer', '_head', '_tail', '_ring',
+                 '_ring_view', 'packet_count', 'checksum_errors', '_log_budget',
+                 '_log_window_end_ns')
+
+    BUFFER_SIZE = 4096  # Initial receive buffer size; grows only if a burst doesn't fit
+    RING_PACKETS = 256  # Completed packets kept for batch consumers
+    ERROR_LOG_RATE = 5  # Bad packets logged per second at most
+
     def __init__(self, config_path=None):
         """Initialize parser with configuration."""
+        self.keep_raw_data = False
         if config_path:
-            with open(config_path) as f:
-                self.config = yaml.safe_load(f)
-        
-        self.buffer = bytearray()
-        self.PACKET_START = bytes([0xB5, 0x62])  # UBX start sequence
-        self.PACKET_SIZE = 80  # Standard RaceBox packet size
+            self.config = load_config(config_path)
+            self.keep_raw_data = self.config.get('debug', {}).get('log_raw_data', False)
+
+        # Preallocated receive buffer; unconsumed data is buffer[_head:_tail]
+        self.buffer = bytearray(self.BUFFER_SIZE)
+        self._head = 0
+        self._tail = 0
+
+        # Preallocated history of completed packets, see packets_since()
+        self._ring = bytearray(self.RING_PACKETS * PACKET_SIZE)
+        self._ring_view = memoryview(self._ring).toreadonly()
+        self.packet_count = 0  # Sequence number of the next completed packet
+        self.checksum_errors = 0
+
+        # Budget for _log_bad_packet, refilled every second
+        self._log_budget = self.ERROR_LOG_RATE
+        self._log_window_end_ns = 0
 
-    def add_data(self, data: bytes) -> List[bytes]:
+    def add_data(self, data: Union[bytes, bytearray, memoryview]) -> List[memoryview]:
         """
         Add received data to buffer and extract complete packets.
-        Returns a list of complete packets found in the data.
+        Accepts any bytes-like object; it is copied into the buffer once and
+        each complete packet is copied once more, into its ring slot.
+        Returns a list of the complete packets found in the data, as read-only
+        memoryviews into the ring. A view is overwritten once the ring wraps,
+        RING_PACKETS packets later, so convert it with bytes() if it must be
+        kept. When one call completes more than RING_PACKETS packets, its
+        packets would overwrite each other, so all of them are returned as
+        read-only memoryviews of their own copies instead.
         """
-        self.buffer.extend(data)
+        buffer = self.buffer
+        head = self._head
+        tail = self._tail
         packets = []
-        
-        while len(self.buffer) >= 2:
-            # Look for packet start sequence
-            if self.buffer[0:2] != self.PACKET_START:
-                # Remove byte until we find start sequence or buffer is too small
-                self.buffer = self.buffer[1:]
-                continue
-                
-            # Check if we have a complete packet
-            if len(self.buffer) >= self.PACKET_SIZE:
-                # Extract packet
-                packet = self.buffer[:self.PACKET_SIZE]
-                packets.append(bytes(packet))
-                self.buffer = self.buffer[self.PACKET_SIZE:]
-            else:
-                # Not enough data for complete packet
-                break
-                
+
+        # Move unconsumed bytes to the front when the data doesn't fit behind
+        # them, and only grow the buffer if it still doesn't
+        n = len(data)
+        if tail + n > len(buffer):
+            buffer[:tail - head] = buffer[head:tail]
+            tail -= head
+            head = 0
+            if tail + n > len(buffer):
+                buffer.extend(bytes(tail + n - len(buffer)))
+        buffer[tail:tail + n] = data
+        tail += n
+
+        # Loop state lives in locals; attribute lookups are the main
+        # interpreter cost of this loop, so they are done once per call
+        sync = PACKET_START
+        size = PACKET_SIZE
+        ring = self._ring
+        ring_view = self._ring_view
+        ring_size = self.RING_PACKETS
+        count = self.packet_count
+        copy = False  # Set once this call's packets no longer fit in the ring
+
+        # A view lets each packet be copied into the ring without an intermediate bytearray
+        with memoryview(buffer) as view:
+            while True:
+                # Look for packet start sequence (C-level search, no per-byte loop)
+                start = buffer.find(sync, head, tail)
+                if start < 0:
+                    # Only a trailing 0xB5 can be the first half of a start sequence
+                    if tail > head and buffer[tail - 1] == sync[0]:
+                        head = tail - 1
+                    else:
+                        head = tail
+                    break
+
+                # Check if we have a complete packet
+                if tail - start < size:
+                    # Not enough data for complete packet
+                    head = start
+                    break
+
+                # Validate the UBX Fletcher checksum over class, id, length and
+                # payload; sum() and accumulate() both run as C loops
+                end = start + size
+                with view[start + 2:end - 2] as body:
+                    ck_a = sum(body) & 0xFF
+                    ck_b = sum(accumulate(body)) & 0xFF
+                if ck_a != view[end - 2] or ck_b != view[end - 1]:
+                    # Not a real packet start, resync from the next byte
+                    self.checksum_errors += 1
+                    self._log_bad_packet("UBX checksum mismatch before packet %d (%d so far)",
+                                         count, self.checksum_errors)
+                    head = start + 1
+                    continue
+
+                # Extract packet into its ring slot. If the next slot still
+                # holds a packet of this call, switch every packet of the call
+                # over to a private copy before the ring overwrites it
+                if not copy and len(packets) == ring_size:
+                    packets = [memoryview(packet.tobytes()) for packet in packets]
+                    copy = True
+                slot = (count % ring_size) * size
+                ring[slot:slot + size] = view[start:end]
+                if copy:
+                    packets.append(memoryview(view[start:end].tobytes()))
+                else:
+                    packets.append(ring_view[slot:slot + size])
+                count += 1
+                head = end
+
+        self.packet_count = count
+
+        # Rewind for free once everything has been consumed
+        if head == tail:
+            head = tail = 0
+        self._head = head
+        self._tail = tail
+
         return packets
 
+    def _log_bad_packet(self, msg: str, *args):
+        """
+        Log a bad packet at debug level, at most ERROR_LOG_RATE times per second.
+        A noisy radio link can produce thousands of bad packets per second;
+        formatting is left to logging, so dropped messages cost nothing.
+        """
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        now = time.monotonic_ns()
+        if now >= self._log_window_end_ns:
+            self._log_budget = self.ERROR_LOG_RATE
+            self._log_window_end_ns = now + 1_000_000_000
+        if self._log_budget:
+            self._log_budget -= 1
+            logger.debug(msg, *args)
+
+    @property
+    def pending(self) -> int:
+        """Number of received bytes not yet consumed as packets."""
+        return self._tail - self._head
+
     def parse_motion_data(self, data: bytes) -> MotionData:
         """Parse motion-related data from packet."""
-        try:
-            acc_x = int.from_bytes(data[68:70], byteorder='little', signed=True) / 1000
-            acc_y = int.from_bytes(data[70:72], byteorder='little', signed=True) / 1000
-            acc_z = int.from_bytes(data[72:74], byteorder='little', signed=True) / 1000
-            
-            rot_x = int.from_bytes(data[74:76], byteorder='little', signed=True) / 100
-            rot_y = int.from_bytes(data[76:78], byteorder='little', signed=True) / 100
-            rot_z = int.from_bytes(data[78:80], byteorder='little', signed=True) / 100
-            
-            return MotionData(acc_x, acc_y, acc_z, rot_x, rot_y, rot_z)
-        except Exception as e:
-            raise ValueError(f"Error parsing motion data: {e}")
+        if len(data) < PACKET_SIZE:
+            raise ValueError(f"Error parsing motion data: expected {PACKET_SIZE} bytes, got {len(data)}")
+        return _decode_packet(data)[0]
 
     def parse_location_data(self, data: bytes) -> LocationData:
         """Parse location-related data from packet."""
-        try:
-            lat = int.from_bytes(data[28:32], byteorder='little', signed=True) / 10000000
-            lon = int.from_bytes(data[24:28], byteorder='little', signed=True) / 10000000
-            speed = int.from_bytes(data[48:52], byteorder='little', signed=True) / 1000 * 3.6
-            satellites = data[23]
-            fix_status = "3D FIX" if data[20] == 3 else "NO FIX"
-            alt_wgs = int.from_bytes(data[32:36], byteorder='little', signed=True) / 1000  # mm to m
-            alt_msl = int.from_bytes(data[36:40], byteorder='little', signed=True) / 1000  # mm to m
-            
-            return LocationData(
-                latitude=lat,
-                longitude=lon,
-                speed=speed,
-                satellites=satellites,
-                fix_status=fix_status,
-                altitude_wgs=alt_wgs,
-                altitude_msl=alt_msl
-            )
-        except Exception as e:
-            raise ValueError(f"Error parsing location data: {e}")
-
-    def parse_packet(self, packet: bytes) -> Optional[ParsedData]:
-        """
-        Parse a complete RaceBox packet.
+        if len(data) < PACKET_SIZE:
+            raise ValueError(f"Error parsing location data: expected {PACKET_SIZE} bytes, got {len(data)}")
+        return _decode_packet(data)[1]
+
+    def parse_packets(self, packets: Union[List[bytes], bytes, bytearray, memoryview]) -> "np.ndarray":
+        """
+        Decode a batch of complete packets in a single vectorized pass.
+        Takes a list of packets or one bytes-like object holding packets back
+        to back; the latter is decoded in place without joining.
+        Returns a PACKET_DTYPE record array with the raw integer fields;
+        scale_records() converts them to display units column by column.
+        Requires numpy.
+        """
+        _require_numpy()
+
+        if isinstance(packets, list):
+            packets = b''.join(packets)
+        return np.frombuffer(packets, dtype=PACKET_DTYPE)
+
+    def feed_batch(self, data: Union[bytes, bytearray, memoryview]) -> ParsedBatch:
+        """
+        Add received data and decode every packet it completes as one batch.
+        The batch's columns are filled straight from the packet ring, or from
+        the packets add_data returns when the read completed more than
+        RING_PACKETS, so no packet is lost and no intermediate copy of the
+        rows is made. Requires numpy.
+        """
+        _require_numpy()
+
+        since = self.packet_count
+        packets = self.add_data(data)
+        if len(packets) <= self.RING_PACKETS:
+            records = self.packets_since(since)[0]
+        else:
+            records = self.parse_packets(packets)
+        return ParsedBatch(records, self.keep_raw_data)
+
+    def packets_since(self, since: int) -> Tuple["np.ndarray", int]:
+        """
+        Return the packets completed since sequence number `since` as
+        PACKET_DTYPE records, along with the sequence number to pass next time.
+        Only the last RING_PACKETS packets are kept. The records are a
+        read-only view into the ring unless they wrap around its end, so copy
+        them if they must outlive the next RING_PACKETS packets. Requires numpy.
+        """
+        _require_numpy()
+
+        count = self.packet_count
+        first = max(since, count - self.RING_PACKETS)
+        # Read-only, like the views add_data hands out
+        records = np.frombuffer(self._ring_view, dtype=PACKET_DTYPE)
+        if first >= count:
+            return records[:0], count
+
+        start = first % self.RING_PACKETS
+        stop = count % self.RING_PACKETS
+        if start < stop:
+            return records[start:stop], count
+        return np.concatenate((records[start:], records[:stop])), count
+
+    def parse_packet(self, packet: Union[bytes, memoryview]) -> Optional[ParsedData]:
+        """
+        Parse a complete RaceBox packet, as bytes or a memoryview from add_data.
         Returns ParsedData if successful, None if packet is invalid.
         """
-        if len(packet) != self.PACKET_SIZE:
+        # Framing is checked up front, so decoding a frame that passes cannot fail
+        if len(packet) != PACKET_SIZE or packet[0:2] != PACKET_START:
+            self._log_bad_packet("Rejected packet of %d bytes", len(packet))
             return None
-            
-        if packet[0:2] != self.PACKET_START:
-            return None
-            
-        try:
-            motion_data = self.parse_motion_data(packet)
-            location_data = self.parse_location_data(packet)
-            
-            return ParsedData(
-                motion=motion_data,
-                location=location_data,
-                raw_data=packet
-            )
-        except Exception as e:
-            print(f"Error parsing packet: {e}")
-            return None
\ No newline at end of file
+
+        return self._parse_packet_unchecked(packet)
+
+    def _parse_packet_unchecked(self, packet: Union[bytes, memoryview]) -> ParsedData:
+        """Parse a packet whose length and start sequence are already known to be valid."""
+        motion_data, location_data = _decode_packet(packet)
+        return ParsedData(
+            motion=motion_data,
+            location=location_data,
+            # Raw bytes are copied out of the ring only when asked for
+            raw_data=bytes(packet) if self.keep_raw_data else None
+        )
+
+    def feed(self, data: Union[bytes, bytearray, memoryview]) -> List[ParsedData]:
+        """
+        Add received data and return every complete packet in it, parsed.
+        Same result as parse_packet() over add_data(), without re-checking
+        framing that add_data has just validated.
+        """
+        parse = self._parse_packet_unchecked
+        return [parse(packet) for packet in self.add_data(data)]
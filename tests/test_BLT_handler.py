@@ -1,12 +1,17 @@
 import asyncio
+import contextlib
+import io
 from pathlib import Path
 import sys
+import unittest
+from unittest import mock
 
 # Add the project root directory to Python path
 project_root = str(Path(__file__).parents[1])
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+from src.handlers import gps_BLT_handler
 from src.handlers.gps_BLT_handler import BLTHandler
 
 def data_callback(data):
@@ -22,6 +27,67 @@ async def test_connection():
     except KeyboardInterrupt:
         print("\nTest stopped by user")
 
+class FakeClient:
+    """Stands in for BleakClient; counts connections and can fail stop_notify like a dropped link."""
+    connections = 0
+    fail_connect = False
+    fail_stop_notify = False
+
+    def __init__(self, address, timeout=None):
+        pass
+
+    async def __aenter__(self):
+        FakeClient.connections += 1
+        if FakeClient.fail_connect:
+            raise RuntimeError("connection failed")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def start_notify(self, uuid, callback):
+        pass
+
+    async def stop_notify(self, uuid):
+        if FakeClient.fail_stop_notify:
+            raise RuntimeError("device disconnected")
+
+class TestBLTHandlerStop(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """Run the handler against FakeClient and a scan that finds a device at once."""
+        FakeClient.connections = 0
+        FakeClient.fail_connect = False
+        FakeClient.fail_stop_notify = False
+        stack = contextlib.ExitStack()
+        self.addCleanup(stack.close)
+        stack.enter_context(mock.patch.object(gps_BLT_handler, 'BleakClient', FakeClient))
+        stack.enter_context(mock.patch.object(BLTHandler, 'find_device',
+                                              mock.AsyncMock(return_value='AA:BB')))
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+        self.handler = BLTHandler(data_callback=data_callback)
+
+    async def run_until_stopped(self, delay=0.05):
+        """Call stop() after `delay` seconds and wait for connect_and_run to return."""
+        asyncio.get_running_loop().call_later(delay, self.handler.stop)
+        return await asyncio.wait_for(self.handler.connect_and_run(), 2)
+
+    async def test_stop_disconnects_once(self):
+        """Test that stop() ends the run after a single connection."""
+        self.assertFalse(await self.run_until_stopped())
+        self.assertEqual(FakeClient.connections, 1)
+
+    async def test_stop_when_stop_notify_fails(self):
+        """Test that a failing stop_notify after stop() doesn't trigger retries."""
+        FakeClient.fail_stop_notify = True
+        self.assertFalse(await self.run_until_stopped())
+        self.assertEqual(FakeClient.connections, 1)
+
+    async def test_stop_during_retry_delay(self):
+        """Test that stop() during the retry delay returns without reconnecting."""
+        FakeClient.fail_connect = True
+        self.assertFalse(await self.run_until_stopped())
+        self.assertEqual(FakeClient.connections, 1)
+
 if __name__ == "__main__":
     print("Starting BLT Handler test...")
     print("Press Ctrl+C to stop")
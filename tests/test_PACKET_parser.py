@@ -7,7 +7,7 @@ project_root = Path(__file__).parents[1]
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from src.handlers.gps_PACKET_parser import PacketParser
+from src.handlers.gps_PACKET_parser import PacketParser, np, scale_records
 
 class TestPacketParser(unittest.TestCase):
     def setUp(self):
@@ -25,6 +25,17 @@ class TestPacketParser(unittest.TestCase):
             "2F FF 56 00 FC FF 06 DB"
         )
 
+    def make_packet(self, speed: int) -> bytes:
+        """Build a valid packet from the example with a different speed field."""
+        packet = bytearray(self.example_packet)
+        packet[54:58] = speed.to_bytes(4, 'little', signed=True)
+        ck_a = ck_b = 0
+        for byte in packet[2:86]:
+            ck_a = (ck_a + byte) & 0xFF
+            ck_b = (ck_b + ck_a) & 0xFF
+        packet[86:88] = bytes((ck_a, ck_b))
+        return bytes(packet)
+
     def test_packet_start_detection(self):
         """Test that parser correctly identifies packet start sequence."""
         self.assertEqual(self.example_packet[0:2], bytes([0xB5, 0x62]))
@@ -44,6 +55,58 @@ class TestPacketParser(unittest.TestCase):
         self.assertEqual(len(packets), 1)  # Should now have one complete packet
         self.assertEqual(packets[0], self.example_packet)
 
+        # Fully consumed data is released from the buffer
+        self.assertEqual(self.parser.pending, 0)
+
+        # Packets are handed out as views; kept raw data is a standalone copy
+        self.parser.keep_raw_data = True
+        parsed_data = self.parser.parse_packet(packets[0])
+        self.assertIsInstance(parsed_data.raw_data, bytes)
+        self.assertEqual(parsed_data.raw_data, self.example_packet)
+
+    def test_packet_resync(self):
+        """Test that leading noise is skipped and split start sequences are kept."""
+        packets = self.parser.add_data(b'\x00\x62\x01' + self.example_packet[:1])
+        self.assertEqual(len(packets), 0)
+
+        packets = self.parser.add_data(self.example_packet[1:] + self.example_packet)
+        self.assertEqual(packets, [self.example_packet, self.example_packet])
+
+        # Data without any start sequence is dropped right away
+        self.assertEqual(self.parser.add_data(b'\x01\x02\x03'), [])
+        self.assertEqual(self.parser.pending, 0)
+
+    def test_packets_beyond_ring_size(self):
+        """Test that one call completing more packets than the ring holds keeps them all."""
+        count = PacketParser.RING_PACKETS + 44
+        frames = [self.make_packet(speed) for speed in range(count)]
+        packets = self.parser.add_data(b''.join(frames))
+        self.assertEqual(len(packets), count)
+        self.assertEqual([bytes(packet) for packet in packets], frames)
+
+        # Every packet is still a read-only memoryview
+        self.assertTrue(all(isinstance(packet, memoryview) and packet.readonly for packet in packets))
+
+    def test_checksum_validation(self):
+        """Test that packets with a bad UBX checksum are dropped."""
+        corrupted = bytearray(self.example_packet)
+        corrupted[40] ^= 0xFF
+        packets = self.parser.add_data(bytes(corrupted) + self.example_packet)
+        self.assertEqual(packets, [self.example_packet])
+        self.assertEqual(self.parser.checksum_errors, 1)
+
+    def test_bad_packet_logging_is_rate_limited(self):
+        """Test that a burst of bad packets logs only a few messages."""
+        corrupted = bytearray(self.example_packet)
+        corrupted[40] ^= 0xFF
+        with self.assertLogs('src.handlers.gps_PACKET_parser', level='DEBUG') as logs:
+            self.parser.add_data(bytes(corrupted) * 20)
+        self.assertEqual(self.parser.checksum_errors, 20)
+        self.assertEqual(len(logs.records), PacketParser.ERROR_LOG_RATE)
+
+        # Messages name the sequence number of the next good packet
+        self.assertIn("before packet 0", logs.output[0])
+
     def test_motion_data_parsing(self):
         """Test parsing of motion data from packet."""
         motion_data = self.parser.parse_motion_data(self.example_packet)
@@ -86,11 +149,131 @@ class TestPacketParser(unittest.TestCase):
         """Test complete packet parsing."""
         parsed_data = self.parser.parse_packet(self.example_packet)
         self.assertIsNotNone(parsed_data)
-        self.assertEqual(parsed_data.raw_data, self.example_packet)
+
+        # Raw data is only kept when debug.log_raw_data is enabled
+        self.assertIsNone(parsed_data.raw_data)
+        self.parser.keep_raw_data = True
+        self.assertEqual(self.parser.parse_packet(self.example_packet).raw_data, self.example_packet)
         
         # Test that both motion and location data are present
         self.assertIsNotNone(parsed_data.motion)
         self.assertIsNotNone(parsed_data.location)
 
+        # The single-pass decode must agree with the per-section parsers
+        self.assertEqual(parsed_data.motion, self.parser.parse_motion_data(self.example_packet))
+        self.assertEqual(parsed_data.location, self.parser.parse_location_data(self.example_packet))
+
+    def test_feed(self):
+        """Test assembling and parsing received data in one call."""
+        self.assertEqual(self.parser.feed(self.example_packet[:40]), [])
+
+        parsed = self.parser.feed(self.example_packet[40:] + self.example_packet)
+        self.assertEqual(len(parsed), 2)
+        self.assertEqual(parsed[0], self.parser.parse_packet(self.example_packet))
+        self.assertEqual(parsed[1].location.satellites, 11)
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_batch_packet_parsing(self):
+        """Test vectorized parsing of several packets at once."""
+        records = self.parser.parse_packets([self.example_packet] * 3)
+        self.assertEqual(len(records), 3)
+
+        self.assertTrue((records['lat'] == 426719035).all())
+        self.assertTrue((records['lon'] == 232887238).all())
+        self.assertTrue((records['speed'] == 35).all())
+        self.assertTrue((records['sats'] == 11).all())
+        self.assertEqual(records['acc'][0].tolist(), [-3, 113, 974])
+        self.assertEqual(records['rot'][0].tolist(), [-209, 86, -4])
+
+        # Vectorized scaling matches the per-packet decoder
+        columns = scale_records(records)
+        location = self.parser.parse_location_data(self.example_packet)
+        motion = self.parser.parse_motion_data(self.example_packet)
+        self.assertEqual(columns['latitude'][0], location.latitude)
+        self.assertEqual(columns['speed'][0], location.speed)
+        self.assertEqual(columns['altitude_msl'][0], location.altitude_msl)
+        self.assertEqual(columns['acceleration'][0].tolist(), [motion.acc_x, motion.acc_y, motion.acc_z])
+        self.assertEqual(columns['rotation'][0].tolist(), [motion.rot_x, motion.rot_y, motion.rot_z])
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_feed_batch(self):
+        """Test decoding all packets of one read as a batch."""
+        batch = self.parser.feed_batch(self.example_packet[:40])
+        self.assertEqual(len(batch), 0)
+
+        batch = self.parser.feed_batch(self.example_packet[40:] + self.example_packet * 2)
+        self.assertEqual(len(batch), 3)
+        self.assertTrue((batch.columns['lon'] == 232887238).all())
+
+        # Each field is its own contiguous integer column
+        self.assertEqual(batch.columns['lat'].strides, (4,))
+        self.assertEqual(batch.columns['acc'].dtype, np.int16)
+        self.assertEqual(batch.columns['acc'].shape, (3, 3))
+        self.assertTrue(batch.columns['acc'].flags['C_CONTIGUOUS'])
+
+        # Columns hold every packet; indexing gives the per-packet result
+        expected = self.parser.parse_packet(self.example_packet)
+        self.assertEqual(batch.latitude.tolist(), [expected.location.latitude] * 3)
+        self.assertEqual(batch.satellites.tolist(), [11] * 3)
+        self.assertEqual(batch.acceleration.shape, (3, 3))
+        self.assertEqual(batch.time_of_week[0], 118286240)
+        self.assertEqual(batch[-1], expected)
+
+        # Raw data follows the parser's keep_raw_data setting, as in parse_packet
+        self.parser.keep_raw_data = True
+        batch = self.parser.feed_batch(self.example_packet)
+        self.assertEqual(batch[0], self.parser.parse_packet(self.example_packet))
+        self.assertEqual(batch[0].raw_data, self.example_packet)
+        self.parser.keep_raw_data = False
+
+        # The batch keeps its values once the ring has been reused
+        batch = self.parser.feed_batch(b''.join(self.make_packet(speed) for speed in range(3)))
+        self.parser.add_data(self.example_packet * PacketParser.RING_PACKETS)
+        self.assertEqual(batch.columns['speed'].tolist(), [0, 1, 2])
+
+        # The same holds for a single-packet batch and one wrapping the ring's end
+        batch = self.parser.feed_batch(self.make_packet(7))
+        self.parser.add_data(self.example_packet * PacketParser.RING_PACKETS)
+        self.assertEqual(batch.columns['speed'].tolist(), [7])
+
+        parser = PacketParser()
+        parser.add_data(self.example_packet * (PacketParser.RING_PACKETS - 4))
+        batch = parser.feed_batch(b''.join(self.make_packet(speed) for speed in range(10)))
+        parser.add_data(self.example_packet * PacketParser.RING_PACKETS)
+        self.assertEqual(batch.columns['speed'].tolist(), list(range(10)))
+
+        # A read completing more packets than the ring holds loses none of them
+        count = PacketParser.RING_PACKETS + 44
+        batch = self.parser.feed_batch(b''.join(self.make_packet(speed) for speed in range(count)))
+        self.assertEqual(batch.columns['speed'].tolist(), list(range(count)))
+
+        # Contiguous packets decode in place, matching the list form
+        joined = self.parser.parse_packets(self.example_packet * 2)
+        listed = self.parser.parse_packets([self.example_packet] * 2)
+        self.assertEqual(joined.tobytes(), listed.tobytes())
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_packets_since(self):
+        """Test reading completed packets back from the ring."""
+        self.parser.add_data(self.example_packet * 3)
+        records, seq = self.parser.packets_since(0)
+        self.assertEqual(seq, 3)
+        self.assertEqual(len(records), 3)
+        self.assertTrue((records['lat'] == 426719035).all())
+
+        # The records can't be used to change packets in the ring
+        with self.assertRaises(ValueError):
+            records['lat'][0] = 0
+
+        records, seq = self.parser.packets_since(seq)
+        self.assertEqual((len(records), seq), (0, 3))
+
+        # Older packets are overwritten once the ring wraps
+        self.parser.add_data(self.example_packet * PacketParser.RING_PACKETS)
+        records, seq = self.parser.packets_since(0)
+        self.assertEqual(seq, PacketParser.RING_PACKETS + 3)
+        self.assertEqual(len(records), PacketParser.RING_PACKETS)
+        self.assertTrue((records['speed'] == 35).all())
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file